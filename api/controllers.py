@@ -1,27 +1,106 @@
-from fastapi import APIRouter, HTTPException
+import os
+from typing import Tuple, Union
 
-from api.models import Usage, UsageResponse
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from api.models import Usage, UsageResponse, UsageSummaryResponse
 from services.calculate_message_cost import calculate_message_credits
 from services.get_messages import get_messages
+from services.shared_usage_cache import shared_usage_cache
+from services.upstream import CircuitOpenError
+from services.usage_snapshot import get_usage_snapshot, revalidate_usage_snapshot, set_usage_snapshot
+from services.usage_summary import usage_summary
+
+# How long a request waits for fresh data before falling back to the last good result
+USAGE_REVALIDATE_WAIT = float(os.getenv("USAGE_REVALIDATE_WAIT", "1"))
 
 router = APIRouter()
 
 
+def calculate_usage() -> UsageResponse:
+    """Scores every message in the current billing period."""
+    usage_data = []
+
+    messages = get_messages()
+    for message in messages:
+        report_name, credits_used = calculate_message_credits(message)
+        usage_entry = Usage(
+            message_id=message.id,
+            timestamp=message.timestamp,
+            report_name=report_name,
+            credits_used=credits_used,
+        )
+        usage_data.append(usage_entry)
+    # Only publish once every message has been scored, so a failed refresh leaves the last good data intact
+    usage_response = UsageResponse(usage=usage_data)
+    usage_summary.replace(usage_data)
+    set_usage_snapshot(usage_response)
+    return usage_response
+
+
+def refresh_usage() -> Union[UsageResponse, Response]:
+    if shared_usage_cache is not None:
+        # Already serialised by whichever worker computed it
+        return Response(content=shared_usage_cache.get_or_compute(calculate_usage), media_type="application/json")
+    return calculate_usage()
+
+
+def get_current_usage() -> Tuple[Union[UsageResponse, Response], bool]:
+    """
+    Returns the usage data and whether it is stale.
+
+    Fresh data is waited on for at most `USAGE_REVALIDATE_WAIT` seconds when there is a last good result to
+    fall back on. If it takes longer or fails, the last good result is returned and the refresh carries on
+    in the background.
+    """
+    last_good_usage = get_usage_snapshot()
+    revalidation = revalidate_usage_snapshot(refresh_usage)
+    if last_good_usage is None:
+        return revalidation.result(), False
+
+    try:
+        return revalidation.result(timeout=USAGE_REVALIDATE_WAIT), False
+    except Exception:
+        return last_good_usage, True
+
+
 @router.get("/usage", response_model=UsageResponse)
-def get_usage_data():
+def get_usage_data(response: Response):
     """Fetches usage data for the current billing period and calculates credits consumed."""
     try:
-        usage_data = []
-
-        for message in get_messages():
-            report_name, credits_used = calculate_message_credits(message)
-            usage_entry = Usage(
-                message_id=message.id,
-                timestamp=message.timestamp,
-                report_name=report_name,
-                credits_used=credits_used,
-            )
-            usage_data.append(usage_entry)
-        return UsageResponse(usage=usage_data)
+        usage, stale = get_current_usage()
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if stale:
+        response.headers["X-Usage-Stale"] = "true"
+    return usage
+
+
+@router.post("/usage/refresh", response_model=UsageResponse)
+def refresh_usage_data():
+    """Discards the cached usage data, in every worker when they share a cache, and recomputes it."""
+    if shared_usage_cache is not None:
+        shared_usage_cache.invalidate()
+    try:
+        return refresh_usage()
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.get("/usage/summary", response_model=UsageSummaryResponse)
+def get_usage_summary(response: Response, top_n: int = Query(5, ge=1, le=100)):
+    """Returns credit totals and the top `top_n` reports by credits for the current billing period."""
+    # Refreshed, and marked stale, under the same rules as `/usage`; the summary is updated alongside the data
+    try:
+        _, stale = get_current_usage()
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+    if stale:
+        response.headers["X-Usage-Stale"] = "true"
+    return usage_summary.summary(top_n)
@@ -25,3 +25,19 @@ class Usage(BaseModel):
 
 class UsageResponse(BaseModel):
     usage: List[Usage]
+
+
+class ReportUsage(BaseModel):
+    report_name: str
+    credits_used: float
+    message_count: int
+
+
+class UsageSummaryResponse(BaseModel):
+    total_credits: float
+    message_count: int
+    report_credits: float
+    report_message_count: int
+    text_credits: float
+    text_message_count: int
+    top_reports: List[ReportUsage]
@@ -3,8 +3,11 @@ from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
 
-from api.models import Message
+from api.models import Message, Usage, UsageResponse
 from app import app
+from services.shared_usage_cache import SharedUsageCache
+from services.usage_snapshot import set_usage_snapshot
+from services.usage_summary import usage_summary
 
 client = TestClient(app)
 
@@ -27,6 +30,13 @@ MOCK_MESSAGES_RESPONSE = {
 MOCK_REPORT_RESPONSE = {"id": 1124, "name": "Short Lease Report", "credit_cost": 61}
 
 
+@pytest.fixture(autouse=True)
+def reset_usage_state():
+    """Clear the usage snapshot and running summary before each test"""
+    set_usage_snapshot(None)
+    usage_summary.clear()
+
+
 @pytest.fixture
 def mock_get_messages():
     with patch("api.controllers.get_messages") as mock_get:
@@ -89,3 +99,102 @@ def test_get_usage_data_empty_messages():
 
         assert response.status_code == 200
         assert response.json()["usage"] == []
+
+
+def test_get_usage_summary(mock_get_messages, mock_calculate_credits):
+    """Test the summary is computed from the current usage data"""
+    response = client.get("/usage/summary")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_credits": 62,
+        "message_count": 2,
+        "report_credits": 62,
+        "report_message_count": 2,
+        "text_credits": 0,
+        "text_message_count": 0,
+        "top_reports": [
+            {"report_name": "Short Lease Report", "credits_used": 61, "message_count": 1},
+            {"report_name": "General Query", "credits_used": 1, "message_count": 1},
+        ],
+    }
+
+    response = client.get("/usage/summary", params={"top_n": 1})
+    assert response.status_code == 200
+    assert [r["report_name"] for r in response.json()["top_reports"]] == ["Short Lease Report"]
+    assert "X-Usage-Stale" not in response.headers
+
+
+def test_get_usage_summary_refreshes_restored_snapshot(mock_get_messages, mock_calculate_credits):
+    """Test that a snapshot restored at startup doesn't stop the summary from being refreshed"""
+    restored = UsageResponse(usage=[Usage(message_id=1, timestamp="2024-01-01T00:00:00Z", credits_used=5.0)])
+    set_usage_snapshot(restored)
+    usage_summary.replace(restored.usage)
+
+    response = client.get("/usage/summary")
+
+    assert response.status_code == 200
+    assert response.json()["total_credits"] == 62
+    assert mock_get_messages.call_count == 1
+
+
+def test_failed_refresh_keeps_summary_consistent(mock_get_messages, mock_calculate_credits):
+    """Test that a refresh failing part way through leaves the summary matching the stale usage data"""
+    client.get("/usage")
+
+    more_messages = [
+        Message(id=2000 + i, timestamp="2024-05-05T00:00:00Z", text="What is the lease term?") for i in range(2)
+    ]
+    mock_get_messages.return_value = mock_get_messages.return_value + more_messages
+    score = mock_calculate_credits.side_effect
+
+    def fail_on_last_message(message):
+        if message.id == 2001:
+            raise Exception("Scoring failed")
+        return score(message)
+
+    mock_calculate_credits.side_effect = fail_on_last_message
+
+    with patch("api.controllers.USAGE_REVALIDATE_WAIT", 5):
+        usage = client.get("/usage")
+        summary = client.get("/usage/summary")
+
+    assert usage.headers["X-Usage-Stale"] == "true"
+    assert len(usage.json()["usage"]) == 2
+    assert summary.headers["X-Usage-Stale"] == "true"
+    assert summary.json()["message_count"] == 2
+    assert summary.json()["total_credits"] == 62
+
+
+def test_get_usage_summary_invalid_top_n():
+    """Test top_n must be positive"""
+    response = client.get("/usage/summary", params={"top_n": 0})
+
+    assert response.status_code == 422
+
+
+def test_get_usage_data_shared_cache(mock_get_messages, mock_calculate_credits, tmp_path):
+    """Test that with a shared cache, usage is computed once and served from the shared file after"""
+    with patch("api.controllers.shared_usage_cache", SharedUsageCache(str(tmp_path / "usage.bin"), ttl=60)):
+        first = client.get("/usage")
+        second = client.get("/usage")
+        summary = client.get("/usage/summary")
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert [entry["message_id"] for entry in first.json()["usage"]] == [1109, 1056]
+    assert summary.json()["total_credits"] == 62
+    assert mock_get_messages.call_count == 1
+
+
+def test_refresh_usage_data_invalidates_shared_cache(mock_get_messages, mock_calculate_credits, tmp_path):
+    """Test that a refresh recomputes usage even when the shared cache is still fresh"""
+    shared_usage_cache = SharedUsageCache(str(tmp_path / "usage.bin"), ttl=60)
+    with patch("api.controllers.shared_usage_cache", shared_usage_cache):
+        client.get("/usage")
+        response = client.post("/usage/refresh")
+        client.get("/usage")
+
+    assert response.status_code == 200
+    assert [entry["message_id"] for entry in response.json()["usage"]] == [1109, 1056]
+    assert mock_get_messages.call_count == 2
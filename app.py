@@ -1,11 +1,40 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.controllers import router
+from services.warm_start import WARM_START_PATH, WARM_START_SAVE_INTERVAL, load_warm_start, save_warm_start
 
-app = FastAPI()
+
+async def save_warm_start_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(save_warm_start)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Restores the warm-start state on startup and persists it periodically and on shutdown."""
+    if not WARM_START_PATH:
+        yield
+        return
+
+    load_warm_start()
+    saver = None
+    if WARM_START_SAVE_INTERVAL > 0:
+        saver = asyncio.create_task(save_warm_start_periodically(WARM_START_SAVE_INTERVAL))
+    try:
+        yield
+    finally:
+        if saver is not None:
+            saver.cancel()
+        save_warm_start()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
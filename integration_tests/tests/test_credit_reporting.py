@@ -8,14 +8,21 @@ from fastapi.testclient import TestClient
 
 from app import app
 from services.calculate_message_cost import calculate_word_cost
-from services.get_report import get_report
+from services.get_messages import messages_circuit
+from services.get_report import get_report, report_circuit
+from services.usage_snapshot import set_usage_snapshot
+from services.usage_summary import usage_summary
 
 
 @pytest.fixture(autouse=True)
 def clear_caches():
-    """Automatically clear all LRU caches before each test"""
+    """Automatically clear all LRU caches and usage state before each test"""
     get_report.cache_clear()
     calculate_word_cost.cache_clear()
+    set_usage_snapshot(None)
+    usage_summary.clear()
+    messages_circuit.reset()
+    report_circuit.reset()
 
 
 client = TestClient(app)
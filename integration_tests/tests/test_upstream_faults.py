@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from services import usage_snapshot
+from services.calculate_message_cost import calculate_word_cost
+from services.get_messages import messages_circuit
+from services.get_report import get_report, report_circuit
+from services.usage_snapshot import set_usage_snapshot
+from services.usage_summary import usage_summary
+
+client = TestClient(app)
+
+DATA_DIR = Path(os.path.dirname(__file__)) / "data"
+
+with open(DATA_DIR / "message.json") as f:
+    MOCK_MESSAGE_DATA = json.load(f)
+
+with open(DATA_DIR / "expected_response.json") as f:
+    EXPECTED_RESPONSE = json.load(f)
+
+MOCK_REPORTS = {}
+for report_id in (5392, 8806):
+    with open(DATA_DIR / f"report_{report_id}.json") as f:
+        MOCK_REPORTS[report_id] = json.load(f)
+
+
+class FaultInjectingServer(ThreadingHTTPServer):
+    """A local stand-in for the message and report APIs that can be made slow or failing."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FaultInjectingHandler)
+        self.delay = 0.0
+        self.status_code = 200
+        self.message_requests = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FaultInjectingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/messages":
+            self.server.message_requests += 1
+            body = MOCK_MESSAGE_DATA
+        else:
+            body = MOCK_REPORTS.get(int(self.path.rsplit("/", 1)[1]))
+
+        time.sleep(self.server.delay)
+        status_code = self.server.status_code if body is not None else 404
+        payload = json.dumps(body if status_code == 200 else {"error": "Service unavailable"}).encode()
+        try:
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def wait_for_revalidation():
+    if usage_snapshot._revalidation is not None:
+        usage_snapshot._revalidation.exception()
+
+
+@pytest.fixture
+def upstream():
+    server = FaultInjectingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    get_report.cache_clear()
+    calculate_word_cost.cache_clear()
+    set_usage_snapshot(None)
+    usage_summary.clear()
+    messages_circuit.reset()
+    report_circuit.reset()
+
+    with patch("services.get_messages.MESSAGES_API_URL", f"{server.url}/messages"), patch(
+        "services.get_report.REPORT_API_URL_TEMPLATE", f"{server.url}/reports/{{id}}"
+    ), patch("services.get_messages.UPSTREAM_TIMEOUT", 0.5), patch("services.get_report.UPSTREAM_TIMEOUT", 0.5), patch(
+        "api.controllers.USAGE_REVALIDATE_WAIT", 0.2
+    ), patch.object(
+        messages_circuit, "failure_threshold", 2
+    ), patch.object(
+        messages_circuit, "reset_timeout", 0.5
+    ):
+        yield server
+        server.delay = 0.0
+        wait_for_revalidation()
+
+    server.shutdown()
+    server.server_close()
+    messages_circuit.reset()
+
+
+def test_healthy_upstream_serves_fresh_data(upstream):
+    response = client.get("/usage")
+
+    assert response.status_code == 200
+    assert response.json() == EXPECTED_RESPONSE
+    assert "X-Usage-Stale" not in response.headers
+
+
+def test_slow_upstream_serves_stale_data(upstream):
+    """Test that a slow upstream doesn't hold up the response once there is a last good result"""
+    client.get("/usage")
+    upstream.delay = 2.0
+
+    start = time.monotonic()
+    response = client.get("/usage")
+    elapsed = time.monotonic() - start
+
+    assert response.status_code == 200
+    assert response.json() == EXPECTED_RESPONSE
+    assert response.headers["X-Usage-Stale"] == "true"
+    assert elapsed < 0.5
+
+
+def test_failing_upstream_opens_circuit(upstream):
+    """Test that a failing upstream serves stale data and stops being called once the circuit opens"""
+    client.get("/usage")
+    upstream.status_code = 500
+
+    for _ in range(4):
+        response = client.get("/usage")
+        wait_for_revalidation()
+        assert response.status_code == 200
+        assert response.json() == EXPECTED_RESPONSE
+        assert response.headers["X-Usage-Stale"] == "true"
+
+    assert messages_circuit.is_open
+    # 1 good request, then 2 failures to open the circuit
+    assert upstream.message_requests == 3
+
+
+def test_upstream_recovery_closes_circuit(upstream):
+    """Test that fresh data is served again once the upstream recovers"""
+    client.get("/usage")
+    upstream.status_code = 500
+    for _ in range(2):
+        client.get("/usage")
+        wait_for_revalidation()
+    assert messages_circuit.is_open
+
+    upstream.status_code = 200
+    time.sleep(0.5)
+    response = client.get("/usage")
+
+    assert response.status_code == 200
+    assert "X-Usage-Stale" not in response.headers
+    assert not messages_circuit.is_open
+
+
+def test_failing_upstream_without_last_good_result(upstream):
+    """Test that errors are still returned when there is nothing to fall back on"""
+    upstream.status_code = 500
+
+    response = client.get("/usage")
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "500: Error fetching message data"}
+
+
+def test_timeout_without_last_good_result(upstream):
+    """Test that a hung upstream is cut off by the timeout"""
+    upstream.delay = 2.0
+
+    start = time.monotonic()
+    response = client.get("/usage")
+    elapsed = time.monotonic() - start
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "500: Error fetching message data"}
+    assert elapsed < 1.5
+
+
+def test_open_circuit_without_last_good_result(upstream):
+    """Test that an open circuit is reported as a 503 when there is nothing to fall back on"""
+    upstream.status_code = 500
+    for _ in range(2):
+        assert client.get("/usage").status_code == 500
+
+    response = client.get("/usage")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Message API is unavailable"}
+    assert upstream.message_requests == 2
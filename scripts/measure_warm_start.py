@@ -0,0 +1,90 @@
+"""
+Measures the time to the first `/usage` response after startup, cold and warm.
+
+Serves the integration test data from a local stub server that adds a fixed delay to every upstream call, then
+starts the app twice: once with no warm-start file and once with the file written by the first run's shutdown.
+
+    python scripts/measure_warm_start.py [--delay 0.2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "integration_tests" / "tests" / "data"
+
+
+class DelayedUpstreamHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        self.server.upstream_calls += 1
+        if self.path == "/messages":
+            path = DATA_DIR / "message.json"
+        else:
+            path = DATA_DIR / f"report_{self.path.rsplit('/', 1)[1]}.json"
+
+        if path.exists():
+            payload = path.read_bytes()
+            self.send_response(200)
+        else:
+            payload = b"{}"
+            self.send_response(404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds added to every upstream call")
+    args = parser.parse_args()
+
+    warm_start_dir = tempfile.mkdtemp()
+    os.environ["WARM_START_PATH"] = os.path.join(warm_start_dir, "warm_start.json")
+    os.environ["WARM_START_SAVE_INTERVAL"] = "0"
+    sys.path.insert(0, str(ROOT))
+
+    from fastapi.testclient import TestClient
+
+    from app import app
+    from services import get_report as get_report_module
+    from services.usage_snapshot import set_usage_snapshot
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DelayedUpstreamHandler)
+    server.delay = args.delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    with patch("services.get_messages.MESSAGES_API_URL", f"{url}/messages"), patch(
+        "services.get_report.REPORT_API_URL_TEMPLATE", f"{url}/reports/{{id}}"
+    ):
+        for label in ("cold", "warm"):
+            # Simulate a fresh process: nothing in memory, only what's on disk
+            get_report_module.get_report.cache_clear()
+            get_report_module._resolved_reports.clear()
+            set_usage_snapshot(None)
+            server.upstream_calls = 0
+
+            with TestClient(app) as client:
+                start = time.perf_counter()
+                response = client.get("/usage")
+                elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            print(f"{label}: first /usage {elapsed:.3f}s, {server.upstream_calls} upstream calls")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
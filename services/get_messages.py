@@ -4,13 +4,20 @@ import requests as message_requests
 from fastapi import HTTPException
 
 from api.models import Message
+from services.upstream import UPSTREAM_TIMEOUT, CircuitBreaker
 
 MESSAGES_API_URL = "https://owpublic.blob.core.windows.net/tech-task/messages/current-period"
 
+messages_circuit = CircuitBreaker("Message API")
+
 
 def get_messages() -> List[Message]:
-    response = message_requests.get(MESSAGES_API_URL)
-    if response.status_code != 200:
-        raise HTTPException(status_code=500, detail="Error fetching message data")
+    with messages_circuit.guard():
+        try:
+            response = message_requests.get(MESSAGES_API_URL, timeout=UPSTREAM_TIMEOUT)
+        except message_requests.RequestException as e:
+            raise HTTPException(status_code=500, detail="Error fetching message data") from e
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail="Error fetching message data")
     messages = [Message(**msg) for msg in response.json()["messages"]]
     return messages
@@ -1,21 +1,66 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import requests as report_requests
 from fastapi import HTTPException
 
 from api.models import Report
+from services.upstream import UPSTREAM_TIMEOUT, CircuitBreaker
 
 REPORT_API_URL_TEMPLATE = "https://owpublic.blob.core.windows.net/tech-task/reports/{id}"
 
+report_circuit = CircuitBreaker("Report API")
 
-@lru_cache
+# Reports restored from a warm start, consumed by the first `get_report` call for each ID
+_primed_reports: Dict[int, Optional[Report]] = {}
+# Every report resolved by the report API, so the cache contents can be persisted
+_resolved_reports: Dict[int, Optional[Report]] = {}
+
+
+# Unbounded, as primed reports are only held here once their primed entry is consumed
+@lru_cache(maxsize=None)
 def get_report(report_id: int) -> Optional[Report]:
     """Fetch the report cost from the report API."""
-    response = report_requests.get(REPORT_API_URL_TEMPLATE.format(id=report_id))
-    if response.status_code == 404:
-        return None
-    elif response.status_code == 200:
-        return Report(**response.json())
-    else:
-        raise HTTPException(status_code=500, detail="Error fetching report data")
+    if report_id in _primed_reports:
+        return _primed_reports.pop(report_id)
+
+    with report_circuit.guard():
+        try:
+            response = report_requests.get(REPORT_API_URL_TEMPLATE.format(id=report_id), timeout=UPSTREAM_TIMEOUT)
+        except report_requests.RequestException as e:
+            raise HTTPException(status_code=500, detail="Error fetching report data") from e
+        if response.status_code == 404:
+            report = None
+        elif response.status_code == 200:
+            report = Report(**response.json())
+        else:
+            raise HTTPException(status_code=500, detail="Error fetching report data")
+    _resolved_reports[report_id] = report
+    return report
+
+
+def get_resolved_reports() -> Dict[int, Optional[Report]]:
+    """Returns every report resolved so far, keyed by report ID (None for reports that don't exist)."""
+    return dict(_resolved_reports)
+
+
+def prime_report_cache(reports: Dict[int, Optional[Report]]) -> None:
+    """Seeds the `get_report` cache with previously resolved reports without calling the report API."""
+    _primed_reports.update(reports)
+    for report_id in reports:
+        get_report(report_id)
+        # Already-cached IDs never consume their primed entry
+        _primed_reports.pop(report_id, None)
+    _resolved_reports.update(reports)
+
+
+def dump_reports(reports: Dict[int, Optional[Report]]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Converts resolved reports into a JSON-serialisable dict."""
+    return {
+        str(report_id): report.model_dump() if report is not None else None for report_id, report in reports.items()
+    }
+
+
+def load_reports(data: Dict[str, Optional[Dict[str, Any]]]) -> Dict[int, Optional[Report]]:
+    """Inverse of `dump_reports`."""
+    return {int(report_id): Report(**report) if report is not None else None for report_id, report in data.items()}
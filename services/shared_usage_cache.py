@@ -0,0 +1,148 @@
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from api.models import UsageResponse
+from services.get_report import dump_reports, get_resolved_reports, load_reports, prime_report_cache
+from services.usage_snapshot import set_usage_snapshot
+from services.usage_summary import usage_summary
+
+SHARED_USAGE_CACHE_PATH = os.getenv("SHARED_USAGE_CACHE_PATH")
+SHARED_USAGE_CACHE_TTL = float(os.getenv("SHARED_USAGE_CACHE_TTL", "30"))
+
+# magic, computed_at (unix time), length of the usage JSON
+_HEADER = struct.Struct("<8sdQ")
+_MAGIC = b"CRUSAGE3"
+
+
+class SharedUsageCache:
+    """
+    A `/usage` response shared between worker processes through a memory-mapped file.
+
+    The file holds a small header, the serialised response JSON and the reports resolved so far. Whichever
+    worker first finds the data missing or older than `ttl` takes an exclusive `flock` and recomputes it;
+    every other worker blocks on the same lock and then reads the result, so upstream APIs are called once
+    per refresh no matter how many workers are running. Each worker primes its report cache from the file,
+    so a refresh only fetches reports that no worker has seen before.
+
+    Files are replaced atomically, so each mapping is immutable and a worker only needs a `stat` per
+    request to notice a new version.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inode: Optional[int] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    def get_or_compute(self, compute: Callable[[], UsageResponse]) -> Union[bytes, memoryview]:
+        """
+        Returns the shared usage JSON, computing it in this worker if no other worker has fresh data.
+
+        Data computed by another worker is returned as a view onto the mapped file, without copying it.
+        """
+        payload = self._read_fresh()
+        if payload is not None:
+            return payload
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker may have refreshed the data while we waited for the lock
+                payload = self._read_fresh()
+                if payload is not None:
+                    return payload
+
+                payload = compute().model_dump_json().encode()
+                self._write(payload)
+                return payload
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def invalidate(self) -> None:
+        """Forces the next request in any worker to recompute the usage data."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _read_fresh(self) -> Optional[memoryview]:
+        with self._lock:
+            if not self._remap():
+                return None
+            _, computed_at, usage_length = _HEADER.unpack_from(self._mmap)
+            if time.time() - computed_at >= self.ttl:
+                return None
+            return memoryview(self._mmap)[_HEADER.size : _HEADER.size + usage_length]
+
+    def _remap(self, sync: bool = True) -> bool:
+        """Maps the current cache file if it has been replaced since it was last mapped."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return False
+        if inode == self._inode:
+            return True
+
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return False
+        if len(mapped) < _HEADER.size or _HEADER.unpack_from(mapped)[0] != _MAGIC:
+            mapped.close()
+            return False
+
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A response is still being served from the old mapping; it's unmapped once that view is released
+                pass
+        self._inode, self._mmap = inode, mapped
+        if sync:
+            usage_length = _HEADER.unpack_from(mapped)[2]
+            usage_end = _HEADER.size + usage_length
+            _sync_local_state(mapped[_HEADER.size : usage_end], mapped[usage_end:])
+        return True
+
+    def _write(self, payload: bytes) -> None:
+        reports = json.dumps(dump_reports(get_resolved_reports())).encode()
+        target = Path(self.path)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, time.time(), len(payload)))
+                f.write(payload)
+                f.write(reports)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            # The writing worker has already recorded this data locally, so skip re-syncing it
+            self._remap(sync=False)
+
+
+def _sync_local_state(payload: bytes, reports: bytes) -> None:
+    """Brings this worker's report cache, usage snapshot and summary in line with another worker's data."""
+    prime_report_cache(load_reports(json.loads(reports)))
+    usage = UsageResponse.model_validate_json(payload)
+    set_usage_snapshot(usage)
+    usage_summary.replace(usage.usage)
+
+
+shared_usage_cache = (
+    SharedUsageCache(SHARED_USAGE_CACHE_PATH, SHARED_USAGE_CACHE_TTL) if SHARED_USAGE_CACHE_PATH else None
+)
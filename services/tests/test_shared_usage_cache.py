@@ -0,0 +1,179 @@
+import multiprocessing
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api.models import Report, Usage, UsageResponse
+from services import get_report as get_report_module
+from services.get_report import get_report
+from services.shared_usage_cache import SharedUsageCache
+from services.usage_snapshot import get_usage_snapshot, set_usage_snapshot
+from services.usage_summary import usage_summary
+
+USAGE = UsageResponse(
+    usage=[Usage(message_id=1, timestamp="2024-01-01T00:00:00Z", report_name="Test Report", credits_used=10.0)]
+)
+
+
+def reset_state():
+    set_usage_snapshot(None)
+    usage_summary.clear()
+    get_report.cache_clear()
+    get_report_module._resolved_reports.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_usage_state():
+    reset_state()
+    yield
+    reset_state()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "usage.bin")
+
+
+def test_second_worker_reads_without_computing(cache_path):
+    """Test that a worker reuses data computed by another worker and syncs its local state"""
+    computes = []
+
+    def compute():
+        computes.append(1)
+        return USAGE
+
+    leader = SharedUsageCache(cache_path, ttl=60)
+    follower = SharedUsageCache(cache_path, ttl=60)
+
+    payload = leader.get_or_compute(compute)
+    set_usage_snapshot(None)
+    usage_summary.clear()
+
+    assert follower.get_or_compute(compute) == payload
+    assert UsageResponse.model_validate_json(payload) == USAGE
+    assert len(computes) == 1
+    assert get_usage_snapshot() == USAGE
+    assert usage_summary.summary(top_n=5).total_credits == 10.0
+
+
+def test_reads_do_not_copy_the_payload(cache_path):
+    """Test that data computed by another worker is served straight from the mapping"""
+    SharedUsageCache(cache_path, ttl=60).get_or_compute(lambda: USAGE)
+
+    payload = SharedUsageCache(cache_path, ttl=60).get_or_compute(lambda: pytest.fail("should not recompute"))
+
+    assert isinstance(payload, memoryview)
+    assert payload == USAGE.model_dump_json().encode()
+
+
+def test_remap_while_payload_is_being_served(cache_path):
+    """Test that a new version can be mapped while a view onto the old one is still in use"""
+    worker = SharedUsageCache(cache_path, ttl=60)
+    SharedUsageCache(cache_path, ttl=60).get_or_compute(lambda: USAGE)
+    old_payload = worker.get_or_compute(lambda: pytest.fail("should not recompute"))
+
+    SharedUsageCache(cache_path, ttl=60).invalidate()
+    SharedUsageCache(cache_path, ttl=60).get_or_compute(lambda: UsageResponse(usage=[]))
+    new_payload = worker.get_or_compute(lambda: pytest.fail("should not recompute"))
+
+    assert old_payload == USAGE.model_dump_json().encode()
+    assert new_payload == b'{"usage":[]}'
+
+
+@patch("services.get_report.report_requests.get")
+def test_reports_are_shared_between_workers(mock_report_get, cache_path):
+    """Test that a worker refreshing the data reuses reports resolved by another worker"""
+    report = Report(id=1, name="Test Report", credit_cost=10.0)
+    # More than the default lru_cache size, so no shared report may be evicted
+    report_ids = range(300)
+
+    def compute_with_reports():
+        for report_id in report_ids:
+            get_report(report_id)
+        return USAGE
+
+    mock_report_get.return_value.status_code = 200
+    mock_report_get.return_value.json.return_value = report.model_dump()
+    SharedUsageCache(cache_path, ttl=60).get_or_compute(compute_with_reports)
+    assert mock_report_get.call_count == len(report_ids)
+
+    # Another worker, with its own empty report cache, picks up the shared data and later refreshes it
+    reset_state()
+    mock_report_get.reset_mock()
+    worker = SharedUsageCache(cache_path, ttl=60)
+    worker.get_or_compute(lambda: pytest.fail("should not recompute"))
+    worker.invalidate()
+    worker.get_or_compute(compute_with_reports)
+
+    mock_report_get.assert_not_called()
+
+
+def test_stale_data_is_recomputed(cache_path):
+    """Test that data older than the TTL is recomputed"""
+    computes = []
+
+    def compute():
+        computes.append(1)
+        return USAGE
+
+    cache = SharedUsageCache(cache_path, ttl=0.05)
+    cache.get_or_compute(compute)
+    time.sleep(0.1)
+    cache.get_or_compute(compute)
+
+    assert len(computes) == 2
+
+
+def test_invalidate_applies_to_all_workers(cache_path):
+    """Test that invalidating from one worker forces a recompute in another"""
+    computes = []
+
+    def compute():
+        computes.append(1)
+        return USAGE
+
+    worker_a = SharedUsageCache(cache_path, ttl=60)
+    worker_b = SharedUsageCache(cache_path, ttl=60)
+    worker_a.get_or_compute(compute)
+    worker_b.get_or_compute(compute)
+
+    worker_a.invalidate()
+    worker_b.get_or_compute(compute)
+
+    assert len(computes) == 2
+
+
+def test_compute_error_is_not_cached(cache_path):
+    """Test that a failed computation propagates and leaves nothing behind"""
+    cache = SharedUsageCache(cache_path, ttl=60)
+
+    def failing_compute():
+        raise RuntimeError("Service unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute(failing_compute)
+
+    assert cache.get_or_compute(lambda: USAGE) == USAGE.model_dump_json().encode()
+
+
+def _compute_in_worker(cache_path, counter_path):
+    def compute():
+        with open(counter_path, "a") as f:
+            f.write("x")
+        # Give the other workers time to pile up on the lock
+        time.sleep(0.2)
+        return USAGE
+
+    return bytes(SharedUsageCache(cache_path, ttl=60).get_or_compute(compute))
+
+
+def test_concurrent_workers_compute_once(cache_path, tmp_path):
+    """Test that simultaneous requests across processes only compute the usage data once"""
+    counter_path = str(tmp_path / "computes")
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        payloads = pool.starmap(_compute_in_worker, [(cache_path, counter_path)] * 4)
+
+    assert len(set(payloads)) == 1
+    with open(counter_path) as f:
+        assert f.read() == "x"
@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+import pytest
+
+from services.upstream import CircuitBreaker, CircuitOpenError
+
+
+def fail(breaker):
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("upstream failed")
+
+
+def test_circuit_opens_after_threshold():
+    """Test the circuit rejects calls once consecutive failures reach the threshold"""
+    breaker = CircuitBreaker("Test API", failure_threshold=2, reset_timeout=30)
+    fail(breaker)
+    assert not breaker.is_open
+    fail(breaker)
+    assert breaker.is_open
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        with breaker.guard():
+            pytest.fail("call should have been rejected")
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == "Test API is unavailable"
+
+
+def test_success_resets_failure_count():
+    """Test that failures must be consecutive to open the circuit"""
+    breaker = CircuitBreaker("Test API", failure_threshold=2, reset_timeout=30)
+    fail(breaker)
+    with breaker.guard():
+        pass
+    fail(breaker)
+
+    assert not breaker.is_open
+
+
+@patch("services.upstream.time.monotonic")
+def test_trial_call_after_reset_timeout(mock_monotonic):
+    """Test a single trial call is allowed after the reset timeout and closes the circuit on success"""
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker("Test API", failure_threshold=1, reset_timeout=30)
+    fail(breaker)
+
+    mock_monotonic.return_value = 131.0
+    with breaker.guard():
+        # Only one trial at a time
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+
+    assert not breaker.is_open
+
+
+@patch("services.upstream.time.monotonic")
+def test_failed_trial_reopens_circuit(mock_monotonic):
+    """Test a failed trial call reopens the circuit for another reset timeout"""
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker("Test API", failure_threshold=1, reset_timeout=30)
+    fail(breaker)
+
+    mock_monotonic.return_value = 131.0
+    fail(breaker)
+
+    mock_monotonic.return_value = 150.0
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+
+
+@patch("services.upstream.time.monotonic")
+def test_call_started_before_opening_does_not_end_trial(mock_monotonic):
+    """Test that a slow call from before the circuit opened can't let a second trial call through"""
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker("Test API", failure_threshold=1, reset_timeout=30)
+
+    slow_call = breaker.guard()
+    slow_call.__enter__()
+    fail(breaker)
+    assert breaker.is_open
+
+    mock_monotonic.return_value = 131.0
+    with breaker.guard():
+        # The slow call finishes while the trial is still running
+        slow_call.__exit__(None, None, None)
+        assert breaker.is_open
+
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+
+    assert not breaker.is_open
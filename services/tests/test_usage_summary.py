@@ -0,0 +1,106 @@
+from api.models import Usage
+from services.usage_summary import UsageSummary
+
+
+def make_usage(message_id, credits_used, report_name=None):
+    return Usage(
+        message_id=message_id,
+        timestamp="2024-01-01T00:00:00Z",
+        report_name=report_name,
+        credits_used=credits_used,
+    )
+
+
+def test_summary_totals():
+    """Test report vs free-text split and totals"""
+    summary = UsageSummary()
+    summary.record(make_usage(1, 10.0, "Report A"))
+    summary.record(make_usage(2, 5.0, "Report B"))
+    summary.record(make_usage(3, 1.5))
+    summary.record(make_usage(4, 2.25))
+
+    result = summary.summary(top_n=5)
+
+    assert result.total_credits == 18.75
+    assert result.message_count == 4
+    assert result.report_credits == 15.0
+    assert result.report_message_count == 2
+    assert result.text_credits == 3.75
+    assert result.text_message_count == 2
+
+
+def test_top_reports_order_and_limit():
+    """Test top reports are ordered by credits and limited to top_n"""
+    summary = UsageSummary()
+    summary.record(make_usage(1, 10.0, "Report A"))
+    summary.record(make_usage(2, 30.0, "Report B"))
+    summary.record(make_usage(3, 15.0, "Report A"))
+    summary.record(make_usage(4, 5.0, "Report C"))
+
+    top = summary.summary(top_n=2).top_reports
+
+    assert [(r.report_name, r.credits_used, r.message_count) for r in top] == [
+        ("Report B", 30.0, 1),
+        ("Report A", 25.0, 2),
+    ]
+    # Reading the top reports must not consume them
+    assert [r.report_name for r in summary.summary(top_n=3).top_reports] == ["Report B", "Report A", "Report C"]
+
+
+def test_rescoring_replaces_previous_row():
+    """Test that recording the same message again doesn't double count it"""
+    summary = UsageSummary()
+    summary.record(make_usage(1, 10.0, "Report A"))
+    summary.record(make_usage(2, 20.0, "Report B"))
+    summary.record(make_usage(1, 50.0, "Report A"))
+    summary.record(make_usage(2, 20.0, "Report B"))
+
+    result = summary.summary(top_n=5)
+
+    assert result.total_credits == 70.0
+    assert result.message_count == 2
+    assert [(r.report_name, r.credits_used) for r in result.top_reports] == [("Report A", 50.0), ("Report B", 20.0)]
+
+
+def test_retain_drops_missing_messages():
+    """Test that messages no longer in the period are removed from the totals"""
+    summary = UsageSummary()
+    summary.record(make_usage(1, 10.0, "Report A"))
+    summary.record(make_usage(2, 20.0, "Report B"))
+    summary.record(make_usage(3, 2.0))
+
+    summary.retain([1])
+
+    result = summary.summary(top_n=5)
+    assert result.total_credits == 10.0
+    assert result.text_message_count == 0
+    assert [r.report_name for r in result.top_reports] == ["Report A"]
+
+
+def test_replace_swaps_in_new_rows():
+    """Test that replace updates changed rows and drops rows missing from the new data"""
+    summary = UsageSummary()
+    summary.replace([make_usage(1, 10.0, "Report A"), make_usage(2, 20.0, "Report B"), make_usage(3, 2.0)])
+
+    summary.replace([make_usage(1, 15.0, "Report A"), make_usage(4, 1.0)])
+
+    result = summary.summary(top_n=5)
+    assert result.total_credits == 16.0
+    assert result.message_count == 2
+    assert result.text_credits == 1.0
+    assert [(r.report_name, r.credits_used) for r in result.top_reports] == [("Report A", 15.0)]
+
+
+def test_top_reports_after_repeated_rescoring():
+    """Test that the top reports stay correct as totals are repeatedly replaced"""
+    summary = UsageSummary()
+    for credits in range(1, 101):
+        summary.record(make_usage(1, float(credits), "Report A"))
+        summary.record(make_usage(2, 50.0, "Report B"))
+        summary.record(make_usage(3, 75.0, "Report C"))
+
+        top = summary.summary(top_n=2).top_reports
+        expected = sorted([("Report A", float(credits)), ("Report B", 50.0), ("Report C", 75.0)], key=lambda r: -r[1])
+        assert [(r.report_name, r.credits_used) for r in top] == expected[:2]
+
+    assert summary.summary(top_n=5).report_credits == 225.0
@@ -0,0 +1,114 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from api.models import Report, Usage, UsageResponse
+from services import get_report as get_report_module
+from services.get_report import dump_reports, get_report, get_resolved_reports
+from services.usage_snapshot import get_usage_snapshot, set_usage_snapshot
+from services.usage_summary import usage_summary
+from services.warm_start import load_warm_start, save_warm_start
+
+
+class MockResponse:
+    def __init__(self, json_data, status_code):
+        self.json_data = json_data
+        self.status_code = status_code
+
+    def json(self):
+        return self.json_data
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    """Start every test with a cold report cache and no usage snapshot"""
+    get_report.cache_clear()
+    get_report_module._resolved_reports.clear()
+    set_usage_snapshot(None)
+    usage_summary.clear()
+    yield
+    get_report.cache_clear()
+    get_report_module._resolved_reports.clear()
+    set_usage_snapshot(None)
+    usage_summary.clear()
+
+
+@patch("services.get_report.report_requests.get")
+def test_warm_start_round_trip(mock_report_get, tmp_path):
+    """Test that a restart restores reports without calling the report API"""
+    mock_report_get.side_effect = [
+        MockResponse({"id": 1, "name": "Test Report", "credit_cost": 10.0}, 200),
+        MockResponse({}, 404),
+    ]
+    get_report(1)
+    get_report(2)
+    usage = UsageResponse(usage=[Usage(message_id=1, timestamp="2024-01-01T00:00:00Z", credits_used=1.0)])
+    set_usage_snapshot(usage)
+
+    path = tmp_path / "warm_start.json"
+    save_warm_start(str(path))
+
+    # Simulate a restart
+    get_report.cache_clear()
+    get_report_module._resolved_reports.clear()
+    set_usage_snapshot(None)
+    mock_report_get.reset_mock()
+
+    assert load_warm_start(str(path)) is True
+    assert get_report(1) == Report(id=1, name="Test Report", credit_cost=10.0)
+    assert get_report(2) is None
+    mock_report_get.assert_not_called()
+    assert get_usage_snapshot() == usage
+    assert usage_summary.summary(top_n=5).text_credits == 1.0
+    assert set(get_resolved_reports()) == {1, 2}
+
+
+def test_load_warm_start_missing_file(tmp_path):
+    """Test that a missing file results in a cold start"""
+    assert load_warm_start(str(tmp_path / "missing.json")) is False
+    assert get_usage_snapshot() is None
+
+
+def test_load_warm_start_corrupt_file(tmp_path):
+    """Test that an unreadable file results in a cold start"""
+    path = tmp_path / "warm_start.json"
+    path.write_text("{not json")
+
+    assert load_warm_start(str(path)) is False
+    assert get_resolved_reports() == {}
+
+
+@pytest.mark.parametrize("contents", ["[]", '{"reports": []}', '{"reports": {}, "usage": []}'])
+def test_load_warm_start_wrong_shape(tmp_path, contents):
+    """Test that valid JSON in the wrong shape results in a cold start"""
+    path = tmp_path / "warm_start.json"
+    path.write_text(contents)
+
+    assert load_warm_start(str(path)) is False
+    assert get_resolved_reports() == {}
+    assert get_usage_snapshot() is None
+
+
+@patch("services.get_report.report_requests.get")
+def test_warm_start_restores_more_reports_than_default_cache_size(mock_report_get, tmp_path):
+    """Test that every restored report is served from the cache, not just the most recently primed"""
+    reports = {report_id: Report(id=report_id, name=f"Report {report_id}", credit_cost=1.0) for report_id in range(300)}
+    path = tmp_path / "warm_start.json"
+    path.write_text(json.dumps({"reports": dump_reports(reports), "usage": None}))
+
+    assert load_warm_start(str(path)) is True
+    for report_id, report in reports.items():
+        assert get_report(report_id) == report
+    mock_report_get.assert_not_called()
+
+
+def test_save_warm_start_failure_leaves_no_temp_file(tmp_path):
+    """Test that a failed write doesn't leave a temporary file behind"""
+    path = tmp_path / "warm_start.json"
+
+    with patch("services.warm_start.json.dump", side_effect=TypeError("not serialisable")):
+        with pytest.raises(TypeError):
+            save_warm_start(str(path))
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import HTTPException
+
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+
+class CircuitOpenError(HTTPException):
+    """Raised instead of calling an upstream API whose circuit is open."""
+
+    def __init__(self, name: str):
+        super().__init__(status_code=503, detail=f"{name} is unavailable")
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream API after repeated failures.
+
+    Each call is wrapped in `guard()`: an exception escaping the block counts as a failure. After
+    `failure_threshold` consecutive failures the circuit opens and calls are rejected immediately with a
+    `CircuitOpenError`. Once `reset_timeout` seconds have passed a single trial call is let through; its
+    outcome closes the circuit or opens it again. Calls that started before the circuit opened don't
+    affect it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        is_trial = self._admit()
+        try:
+            yield
+        except BaseException:
+            self._record(succeeded=False, is_trial=is_trial)
+            raise
+        self._record(succeeded=True, is_trial=is_trial)
+
+    def _admit(self) -> bool:
+        """Raises if the call must be rejected, otherwise returns whether it is the half-open trial call."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(self.name)
+            self._trial_in_flight = True
+            return True
+
+    def _record(self, succeeded: bool, is_trial: bool) -> None:
+        with self._lock:
+            if is_trial:
+                self._trial_in_flight = False
+            elif self._opened_at is not None:
+                # Started before the circuit opened, so it says nothing about whether the API has recovered
+                return
+
+            if succeeded:
+                self._failures = 0
+                self._opened_at = None
+            else:
+                self._failures += 1
+                if is_trial or self._failures >= self.failure_threshold:
+                    self._opened_at = time.monotonic()
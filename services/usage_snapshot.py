@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from api.models import UsageResponse
+
+_usage_snapshot: Optional[UsageResponse] = None
+
+_revalidation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usage-revalidation")
+_revalidation_lock = threading.Lock()
+_revalidation: Optional[Future] = None
+
+
+def get_usage_snapshot() -> Optional[UsageResponse]:
+    """Returns the most recently computed usage response, if any."""
+    return _usage_snapshot
+
+
+def set_usage_snapshot(usage: Optional[UsageResponse]) -> None:
+    """Records the most recently computed usage response."""
+    global _usage_snapshot
+    _usage_snapshot = usage
+
+
+def revalidate_usage_snapshot(refresh: Callable[[], Any]) -> Future:
+    """
+    Runs `refresh` in the background, or joins the refresh that is already running.
+
+    Concurrent requests share one refresh, so a slow upstream is only waited on once however many requests
+    arrive in the meantime.
+    """
+    global _revalidation
+    with _revalidation_lock:
+        if _revalidation is None or _revalidation.done():
+            _revalidation = _revalidation_executor.submit(refresh)
+        return _revalidation
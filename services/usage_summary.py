@@ -0,0 +1,124 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Tuple
+
+from api.models import ReportUsage, Usage, UsageSummaryResponse
+
+
+class UsageSummary:
+    """
+    Running totals over scored usage rows.
+
+    Rows are keyed by message ID, so re-scoring a message replaces its previous contribution instead of
+    double-counting it. The top reports are kept in a max-heap of (-credits, report_name) entries; entries
+    are never updated in place; a new one is pushed on every change and stale ones are dropped when read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rows: Dict[int, Usage] = {}
+        self._report_credits: DefaultDict[str, float] = defaultdict(float)
+        self._report_counts: DefaultDict[str, int] = defaultdict(int)
+        self._report_heap: List[Tuple[float, str]] = []
+        self._report_total_credits = 0.0
+        self._report_total_count = 0
+        self._text_credits = 0.0
+        self._text_count = 0
+
+    def record(self, usage: Usage) -> None:
+        """Adds a scored usage row, replacing any earlier row for the same message."""
+        with self._lock:
+            self._record(usage)
+
+    def retain(self, message_ids: Iterable[int]) -> None:
+        """Drops rows for messages that are no longer part of the current period."""
+        with self._lock:
+            self._retain(message_ids)
+
+    def replace(self, usage: Iterable[Usage]) -> None:
+        """
+        Makes `usage` the full set of rows in one step, so readers never see a mix of old and new rows.
+
+        Only rows that changed are re-applied to the totals.
+        """
+        usage = list(usage)
+        with self._lock:
+            for usage_entry in usage:
+                self._record(usage_entry)
+            self._retain(usage_entry.message_id for usage_entry in usage)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def summary(self, top_n: int) -> UsageSummaryResponse:
+        with self._lock:
+            return UsageSummaryResponse(
+                total_credits=round(self._report_total_credits + self._text_credits, 2),
+                message_count=len(self._rows),
+                report_credits=round(self._report_total_credits, 2),
+                report_message_count=self._report_total_count,
+                text_credits=round(self._text_credits, 2),
+                text_message_count=self._text_count,
+                top_reports=self._top_reports(top_n),
+            )
+
+    def _record(self, usage: Usage) -> None:
+        previous = self._rows.get(usage.message_id)
+        if previous is not None:
+            self._apply(previous, -1)
+        self._rows[usage.message_id] = usage
+        self._apply(usage, 1)
+
+    def _retain(self, message_ids: Iterable[int]) -> None:
+        keep = set(message_ids)
+        for message_id in [message_id for message_id in self._rows if message_id not in keep]:
+            self._apply(self._rows.pop(message_id), -1)
+
+    def _apply(self, usage: Usage, sign: int) -> None:
+        if usage.report_name is None:
+            self._text_credits += sign * usage.credits_used
+            self._text_count += sign
+            return
+
+        name = usage.report_name
+        self._report_total_credits += sign * usage.credits_used
+        self._report_total_count += sign
+        self._report_credits[name] += sign * usage.credits_used
+        self._report_counts[name] += sign
+        if self._report_counts[name] == 0:
+            del self._report_credits[name]
+            del self._report_counts[name]
+        else:
+            heapq.heappush(self._report_heap, (-self._report_credits[name], name))
+
+        # Stale entries are only dropped when they reach the top, so rebuild once they dominate the heap
+        if len(self._report_heap) > 2 * len(self._report_credits) + 16:
+            self._report_heap = [(-credits, name) for name, credits in self._report_credits.items()]
+            heapq.heapify(self._report_heap)
+
+    def _is_current(self, entry: Tuple[float, str]) -> bool:
+        credits, name = entry
+        return name in self._report_credits and -credits == self._report_credits[name]
+
+    def _top_reports(self, top_n: int) -> List[ReportUsage]:
+        top: List[Tuple[float, str]] = []
+        while self._report_heap and len(top) < top_n:
+            entry = heapq.heappop(self._report_heap)
+            # The same total can be pushed more than once, e.g. after a message is re-scored unchanged
+            if self._is_current(entry) and (not top or top[-1] != entry):
+                top.append(entry)
+        for entry in top:
+            heapq.heappush(self._report_heap, entry)
+
+        return [
+            ReportUsage(report_name=name, credits_used=round(-credits, 2), message_count=self._report_counts[name])
+            for credits, name in top
+        ]
+
+
+usage_summary = UsageSummary()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from api.models import UsageResponse
+from services.get_report import dump_reports, get_resolved_reports, load_reports, prime_report_cache
+from services.usage_snapshot import get_usage_snapshot, set_usage_snapshot
+from services.usage_summary import usage_summary
+
+WARM_START_PATH = os.getenv("WARM_START_PATH")
+WARM_START_SAVE_INTERVAL = float(os.getenv("WARM_START_SAVE_INTERVAL", "60"))
+
+
+def save_warm_start(path: Optional[str] = WARM_START_PATH) -> None:
+    """Persists the resolved reports and the last usage snapshot to `path`."""
+    if not path:
+        return
+
+    usage = get_usage_snapshot()
+    state = {
+        "reports": dump_reports(get_resolved_reports()),
+        "usage": usage.model_dump() if usage is not None else None,
+    }
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file and rename so a crash mid-write never leaves a truncated file behind
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_warm_start(path: Optional[str] = WARM_START_PATH) -> bool:
+    """
+    Restores the report cache and the last usage snapshot from `path`.
+
+    Returns False if there is nothing to restore or the file can't be read, in which case the service
+    simply starts cold.
+    """
+    if not path or not os.path.exists(path):
+        return False
+
+    try:
+        with open(path) as f:
+            state = json.load(f)
+        if not isinstance(state, dict):
+            return False
+        reports = load_reports(state.get("reports", {}))
+        usage = UsageResponse(**state["usage"]) if state.get("usage") is not None else None
+    except (OSError, ValueError, TypeError, AttributeError):
+        return False
+
+    prime_report_cache(reports)
+    if usage is not None:
+        set_usage_snapshot(usage)
+        usage_summary.replace(usage.usage)
+    return True
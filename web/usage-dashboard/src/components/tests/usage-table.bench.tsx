@@ -0,0 +1,104 @@
+import { act, cleanup, fireEvent, render, screen } from '@testing-library/react'
+import { bench, describe, vi } from 'vitest'
+import { MemoryRouter } from 'react-router-dom'
+import { QueryClient, QueryClientProvider } from '@tanstack/react-query'
+import { getCoreRowModel, useReactTable } from '@tanstack/react-table'
+import UsageTable from '../usage-table'
+import { columns } from '../usage-table/columns'
+import { UsageTableRows } from '../usage-table/TableRows'
+import { type UsageData } from '../../lib/client'
+import { aggregateDaily, sortOrder, toColumns } from '../../lib/usage-columns'
+import { type WorkerUsage } from '../../lib/usage-worker-client'
+
+const ROW_COUNT = 100_000
+const PAGE_SIZE = 1000
+const SORT_URL = '/?sort=report_name%3Aasc%2Ccredits_used%3Adesc'
+
+const data: UsageData[] = Array.from({ length: ROW_COUNT }, (_, index) => ({
+  message_id: index,
+  timestamp: new Date(Date.UTC(2024, 3, 1) + index * 12_000).toISOString(),
+  report_name: index % 3 === 0 ? null : `Report ${index % 50}`,
+  credits_used: (index % 97) / 7,
+}))
+
+const usageColumns = toColumns(data)
+const workerUsage: WorkerUsage = { version: 0, columns: usageColumns, daily: aggregateDaily(usageColumns) }
+
+// jsdom has no Worker, so the worker path is stood in for by running the worker's sort in-process
+const mode = vi.hoisted(() => ({ worker: false }))
+
+vi.mock('../../lib/client', () => ({
+  fetchUsageData: () => Promise.resolve(data),
+  getWorkerUsage: (usage: UsageData[] | undefined) => (mode.worker && usage === data ? workerUsage : undefined),
+}))
+
+vi.mock('../../lib/usage-worker-client', async importOriginal => ({
+  ...(await importOriginal<typeof import('../../lib/usage-worker-client')>()),
+  sortInWorker: (_version: number, sorting: Parameters<typeof sortOrder>[1]) =>
+    Promise.resolve(sortOrder(usageColumns, sorting)),
+}))
+
+const renderTable = async (initialUrl: string) => {
+  const queryClient = new QueryClient({
+    defaultOptions: {
+      queries: {
+        retry: false,
+      },
+    },
+  })
+
+  render(
+    <QueryClientProvider client={queryClient}>
+      <MemoryRouter initialEntries={[initialUrl]}>
+        <UsageTable />
+      </MemoryRouter>
+    </QueryClientProvider>
+  )
+  await screen.findByTestId('usage-table-content')
+  // Page size isn't part of the URL, so switch to the largest page the same way a user would
+  fireEvent.change(screen.getByRole('combobox'), { target: { value: String(PAGE_SIZE) } })
+  // Let a pending worker sort land
+  await act(async () => {})
+  cleanup()
+}
+
+describe(`render usage table with ${ROW_COUNT} rows, ${PAGE_SIZE} per page`, () => {
+  bench('unsorted', async () => {
+    mode.worker = false
+    await renderTable('/')
+  })
+
+  bench('sorted by report name then credits, on the main thread', async () => {
+    mode.worker = false
+    await renderTable(SORT_URL)
+  })
+
+  bench('sorted by report name then credits, by the usage worker', async () => {
+    mode.worker = true
+    await renderTable(SORT_URL)
+  })
+})
+
+function VirtualBody({ rows }: { rows: UsageData[] }) {
+  const table = useReactTable({ data: rows, columns, getCoreRowModel: getCoreRowModel() })
+  return <UsageTableRows headerGroups={table.getHeaderGroups()} rows={table.getRowModel().rows} />
+}
+
+describe(`virtualized body with ${PAGE_SIZE} rows`, () => {
+  const page = data.slice(0, PAGE_SIZE)
+
+  bench('mount', () => {
+    render(<VirtualBody rows={page} />)
+    cleanup()
+  })
+
+  bench('scroll from top to bottom', () => {
+    render(<VirtualBody rows={page} />)
+    const container = screen.getByTestId('usage-table-scroll')
+    for (let scrollTop = 0; scrollTop <= PAGE_SIZE * 53; scrollTop += 600) {
+      Object.defineProperty(container, 'scrollTop', { value: scrollTop, configurable: true })
+      fireEvent.scroll(container)
+    }
+    cleanup()
+  })
+})
@@ -1,4 +1,4 @@
-import { render, screen } from '@testing-library/react'
+import { render, screen, fireEvent } from '@testing-library/react'
 import { describe, it, expect, beforeEach, vi } from 'vitest'
 import { MemoryRouter } from 'react-router-dom'
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query'
@@ -79,4 +79,48 @@ describe('UsageTable', () => {
     expect(screen.getByText('20-03-2024 10:00')).toBeInTheDocument()
     expect(screen.getByText('20-03-2024 11:00')).toBeInTheDocument()
   })
-}) 
\ No newline at end of file
+
+  it('only renders the visible rows of a large page', async () => {
+    const largeUsageData = Array.from({ length: 1000 }, (_, index) => ({
+      message_id: index,
+      timestamp: '2024-03-20T10:00:00Z',
+      report_name: 'Daily Report',
+      credits_used: 1,
+    }))
+    vi.mocked(fetchUsageData).mockResolvedValue(largeUsageData)
+
+    renderWithProviders(<UsageTable />)
+    await screen.findByTestId('usage-table-content')
+    fireEvent.change(screen.getByRole('combobox'), { target: { value: '1000' } })
+
+    const rows = screen.getAllByRole('row').slice(1) // Skip header row
+    expect(rows.length).toBeGreaterThan(10)
+    expect(rows.length).toBeLessThan(50)
+  })
+
+  it('keeps the header pinned and starts a new page at the top', async () => {
+    const largeUsageData = Array.from({ length: 2000 }, (_, index) => ({
+      message_id: index,
+      timestamp: '2024-03-20T10:00:00Z',
+      report_name: 'Daily Report',
+      credits_used: index,
+    }))
+    vi.mocked(fetchUsageData).mockResolvedValue(largeUsageData)
+
+    renderWithProviders(<UsageTable />)
+    await screen.findByTestId('usage-table-content')
+    fireEvent.change(screen.getByRole('combobox'), { target: { value: '1000' } })
+    expect(screen.getByTestId('usage-table-header')).toHaveClass('sticky')
+
+    // jsdom doesn't lay anything out, so stand in for the browser's scroll position
+    const container = screen.getByTestId('usage-table-scroll')
+    Object.defineProperty(container, 'scrollTop', { value: 5000, writable: true })
+    fireEvent.scroll(container)
+    expect(screen.queryByText('0.00')).not.toBeInTheDocument()
+
+    fireEvent.click(screen.getByText('>'))
+
+    expect(container.scrollTop).toBe(0)
+    expect(screen.getByText('1000.00')).toBeInTheDocument()
+  })
+})
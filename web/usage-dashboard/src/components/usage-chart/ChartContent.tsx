@@ -19,6 +19,7 @@ import { processChartData } from '@/lib/chart-utils'
 export function ChartContent() {
   const { data, isLoading, isError, error } = useQuery<UsageData[], Error>({
     queryKey: ['usageData'],
+    structuralSharing: false,
   })
 
   const chartData = useMemo(() => processChartData(data), [data])
@@ -7,13 +7,12 @@ import {
   getSortedRowModel,
   getPaginationRowModel,
   SortingState,
-  flexRender,
 } from '@tanstack/react-table'
 import { Card, CardContent } from "@/components/ui/card"
-import { Table, TableBody, TableCell, TableRow } from "@/components/ui/table"
 import { type UsageData, fetchUsageData } from '@/lib/client'
+import { useWorkerSorting } from '@/lib/use-worker-sorting'
 import { columns } from './columns'
-import { UsageTableHeader } from './TableHeader'
+import { UsageTableRows } from './TableRows'
 import { TablePagination } from './TablePagination'
 import { TableLoading } from './TableLoading'
 import { TableError } from './TableError'
@@ -36,8 +35,13 @@ export function UsageTableContent() {
   const { data, isLoading, isError, error } = useQuery<UsageData[], Error>({
     queryKey: ['usageData'],
     queryFn: fetchUsageData,
+    // Comparing every row against the previous response is too slow for large
+    // periods, and the usage worker keys its results on the array identity
+    structuralSharing: false,
   })
 
+  const { rows: sortedData, manualSorting } = useWorkerSorting(data, sorting)
+
   useEffect(() => {
     const searchParams = new URLSearchParams(location.search)
     if (sorting.length > 0) {
@@ -57,13 +61,14 @@ export function UsageTableContent() {
   })
 
   const table = useReactTable({
-    data: data || [],
+    data: sortedData || [],
     columns,
     state: { 
       sorting,
       pagination,
     },
     isMultiSortEvent: () => true,
+    manualSorting,
     onSortingChange: setSorting,
     onPaginationChange: setPagination,
     getCoreRowModel: getCoreRowModel(),
@@ -82,20 +87,11 @@ export function UsageTableContent() {
   return (
     <Card className="w-full" data-testid="usage-table-content">
       <CardContent>
-        <Table>
-          <UsageTableHeader headerGroups={table.getHeaderGroups()} />
-          <TableBody>
-            {table.getRowModel().rows.map(row => (
-              <TableRow key={row.id}>
-                {row.getVisibleCells().map(cell => (
-                  <TableCell key={cell.id}>
-                    {flexRender(cell.column.columnDef.cell, cell.getContext())}
-                  </TableCell>
-                ))}
-              </TableRow>
-            ))}
-          </TableBody>
-        </Table>
+        <UsageTableRows
+          headerGroups={table.getHeaderGroups()}
+          rows={table.getRowModel().rows}
+          scrollResetKey={JSON.stringify([pagination, sorting])}
+        />
         <TablePagination table={table} />
       </CardContent>
     </Card>
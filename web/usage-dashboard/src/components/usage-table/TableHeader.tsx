@@ -5,11 +5,12 @@ import { type UsageData } from '@/lib/client'
 
 interface UsageTableHeaderProps {
   headerGroups: HeaderGroup<UsageData>[]
+  className?: string
 }
 
-export function UsageTableHeader({ headerGroups }: UsageTableHeaderProps) {
+export function UsageTableHeader({ headerGroups, className }: UsageTableHeaderProps) {
   return (
-    <TableHeader data-testid="usage-table-header">
+    <TableHeader className={className} data-testid="usage-table-header">
       {headerGroups.map(headerGroup => (
         <TableRow key={headerGroup.id}>
           {headerGroup.headers.map(header => (
@@ -51,7 +51,7 @@ export function TablePagination<T>({ table }: TablePaginationProps<T>) {
         }}
         className="rounded border p-1 bg-white dark:bg-gray-800"
       >
-        {[10, 20, 30, 40, 50].map(pageSize => (
+        {[10, 20, 30, 40, 50, 100, 500, 1000].map(pageSize => (
           <option key={pageSize} value={pageSize}>
             Show {pageSize}
           </option>
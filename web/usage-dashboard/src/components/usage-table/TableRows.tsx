@@ -0,0 +1,59 @@
+import { useEffect } from 'react'
+import { flexRender, type HeaderGroup, type Row } from '@tanstack/react-table'
+import { TableBody, TableCell, TableRow } from "@/components/ui/table"
+import { type UsageData } from '@/lib/client'
+import { useVirtualRows } from '@/lib/use-virtual-rows'
+import { UsageTableHeader } from './TableHeader'
+
+const ROW_HEIGHT = 53
+const MAX_TABLE_HEIGHT = 600
+
+interface UsageTableRowsProps {
+  headerGroups: HeaderGroup<UsageData>[]
+  rows: Row<UsageData>[]
+  // Scrolls back to the top whenever this changes, so a new page or sort order starts at its first row
+  scrollResetKey?: string
+}
+
+// The scrollable part of the usage table. Only the rows in view are rendered,
+// and the header stays pinned to the top while the rows scroll under it.
+export function UsageTableRows({ headerGroups, rows, scrollResetKey }: UsageTableRowsProps) {
+  const { containerRef, scrollToTop, start, end, paddingTop, paddingBottom } = useVirtualRows(rows.length, {
+    rowHeight: ROW_HEIGHT,
+    viewportHeight: MAX_TABLE_HEIGHT,
+  })
+
+  useEffect(() => {
+    scrollToTop()
+  }, [scrollToTop, scrollResetKey])
+
+  return (
+    <div
+      ref={containerRef}
+      className="overflow-auto"
+      style={{ maxHeight: MAX_TABLE_HEIGHT }}
+      data-testid="usage-table-scroll"
+    >
+      {/* A plain <table> rather than ui/table's <Table>, whose own overflow wrapper would stop the header sticking */}
+      <table className="w-full caption-bottom text-sm">
+        <UsageTableHeader
+          className="sticky top-0 z-10 bg-white dark:bg-neutral-950"
+          headerGroups={headerGroups}
+        />
+        <TableBody>
+          {paddingTop > 0 && <tr aria-hidden style={{ height: paddingTop }} />}
+          {rows.slice(start, end).map(row => (
+            <TableRow key={row.id} style={{ height: ROW_HEIGHT }}>
+              {row.getVisibleCells().map(cell => (
+                <TableCell key={cell.id}>
+                  {flexRender(cell.column.columnDef.cell, cell.getContext())}
+                </TableCell>
+              ))}
+            </TableRow>
+          ))}
+          {paddingBottom > 0 && <tr aria-hidden style={{ height: paddingBottom }} />}
+        </TableBody>
+      </table>
+    </div>
+  )
+}
@@ -1,3 +1,11 @@
+import { fromColumns } from '@/lib/usage-columns'
+import {
+  UsageWorkerError,
+  fetchUsageInWorker,
+  isUsageWorkerSupported,
+  type WorkerUsage,
+} from '@/lib/usage-worker-client'
+
 interface UsageData {
   message_id: number
   timestamp: string
@@ -7,7 +15,27 @@ interface UsageData {
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL
 
+// Worker-side results for data fetched through the worker, so the chart and
+// table can reuse them instead of recomputing on the main thread. The row
+// objects themselves are still rebuilt from the columns on the main thread,
+// as TanStack Table needs them; only parsing, the chart rollup and sorting
+// happen in the worker.
+const workerUsage = new WeakMap<UsageData[], WorkerUsage>()
+
 export const fetchUsageData = async (): Promise<UsageData[]> => {
+  if (isUsageWorkerSupported()) {
+    try {
+      const usage = await fetchUsageInWorker(`${API_BASE_URL}/usage`)
+      const data = fromColumns(usage.columns)
+      workerUsage.set(data, usage)
+      return data
+    } catch (error) {
+      // Fetch and network errors are reported as usual; only a broken worker falls back to the main thread
+      if (!(error instanceof UsageWorkerError)) throw error
+      console.error(error)
+    }
+  }
+
   const response = await fetch(`${API_BASE_URL}/usage`)
   if (!response.ok) {
     throw new Error('Network response was not ok')
@@ -16,4 +44,7 @@ export const fetchUsageData = async (): Promise<UsageData[]> => {
   return data.usage
 }
 
+export const getWorkerUsage = (data: UsageData[] | undefined): WorkerUsage | undefined =>
+  data && workerUsage.get(data)
+
 export type { UsageData }
@@ -0,0 +1,177 @@
+import type { SortingState } from '@tanstack/react-table'
+import type { UsageData } from '@/lib/client'
+
+// Column-oriented usage data. Numeric columns are typed arrays so they can be
+// transferred between the worker and the main thread without copying.
+export interface UsageColumns {
+  messageIds: Float64Array
+  timestamps: string[]
+  times: Float64Array
+  credits: Float64Array
+  reportIndex: Int32Array // Index into reportNames, -1 when the message has no report
+  reportNames: string[]
+}
+
+export interface DailyUsage {
+  date: string
+  credits: number
+}
+
+export function toColumns(data: UsageData[]): UsageColumns {
+  const count = data.length
+  const columns: UsageColumns = {
+    messageIds: new Float64Array(count),
+    timestamps: new Array<string>(count),
+    times: new Float64Array(count),
+    credits: new Float64Array(count),
+    reportIndex: new Int32Array(count),
+    reportNames: [],
+  }
+  const reportIds = new Map<string, number>()
+
+  for (let i = 0; i < count; i++) {
+    const usage = data[i]
+    columns.messageIds[i] = usage.message_id
+    columns.timestamps[i] = usage.timestamp
+    columns.times[i] = Date.parse(usage.timestamp)
+    columns.credits[i] = usage.credits_used
+
+    if (usage.report_name === null) {
+      columns.reportIndex[i] = -1
+      continue
+    }
+    let reportId = reportIds.get(usage.report_name)
+    if (reportId === undefined) {
+      reportId = columns.reportNames.length
+      reportIds.set(usage.report_name, reportId)
+      columns.reportNames.push(usage.report_name)
+    }
+    columns.reportIndex[i] = reportId
+  }
+
+  return columns
+}
+
+export function fromColumns(columns: UsageColumns): UsageData[] {
+  const data = new Array<UsageData>(columns.credits.length)
+  for (let i = 0; i < data.length; i++) {
+    const reportId = columns.reportIndex[i]
+    data[i] = {
+      message_id: columns.messageIds[i],
+      timestamp: columns.timestamps[i],
+      report_name: reportId === -1 ? null : columns.reportNames[reportId],
+      credits_used: columns.credits[i],
+    }
+  }
+  return data
+}
+
+export function aggregateDaily(columns: UsageColumns): DailyUsage[] {
+  const dailyCredits = new Map<number, number>()
+  // Rows usually arrive grouped by day, so only build a Date when leaving the current day
+  let dayStart = NaN
+  let dayEnd = NaN
+
+  for (let i = 0; i < columns.times.length; i++) {
+    const time = columns.times[i]
+    if (!(time >= dayStart && time < dayEnd)) {
+      const day = new Date(time)
+      day.setHours(0, 0, 0, 0)
+      dayStart = day.getTime()
+      day.setDate(day.getDate() + 1)
+      dayEnd = day.getTime()
+    }
+    dailyCredits.set(dayStart, (dailyCredits.get(dayStart) ?? 0) + columns.credits[i])
+  }
+
+  return Array.from(dailyCredits.keys())
+    .sort((a, b) => a - b)
+    .map((day): DailyUsage => ({
+      date: new Date(day).toISOString(),
+      credits: Number(dailyCredits.get(day)!.toFixed(2)),
+    }))
+}
+
+// Port of TanStack Table's `alphanumeric` sorting function, so worker-sorted
+// rows come out in the same order as `getSortedRowModel`
+const reSplitAlphaNumeric = /([0-9]+)/gm
+
+function compareAlphanumeric(aStr: string, bStr: string): number {
+  const a = aStr.split(reSplitAlphaNumeric).filter(Boolean)
+  const b = bStr.split(reSplitAlphaNumeric).filter(Boolean)
+
+  while (a.length && b.length) {
+    const aa = a.shift()!
+    const bb = b.shift()!
+
+    const an = parseInt(aa, 10)
+    const bn = parseInt(bb, 10)
+
+    const combo = [an, bn].sort()
+
+    if (isNaN(combo[0])) {
+      if (aa > bb) return 1
+      if (bb > aa) return -1
+      continue
+    }
+
+    if (isNaN(combo[1])) {
+      return isNaN(an) ? -1 : 1
+    }
+
+    if (an > bn) return 1
+    if (bn > an) return -1
+  }
+
+  return a.length - b.length
+}
+
+// Ranks every report name (and "no report", which sorts as an empty string)
+// once, so rows can be compared by number rather than by string
+function reportRanks(columns: UsageColumns): Float64Array {
+  const names = ['', ...columns.reportNames.map(name => name.toLowerCase())]
+  const byName = names.map((_, id) => id).sort((a, b) => compareAlphanumeric(names[a], names[b]))
+
+  const rankById = new Float64Array(names.length)
+  for (let i = 1; i < byName.length; i++) {
+    const tied = compareAlphanumeric(names[byName[i - 1]], names[byName[i]]) === 0
+    rankById[byName[i]] = tied ? rankById[byName[i - 1]] : i
+  }
+
+  const ranks = new Float64Array(columns.reportIndex.length)
+  for (let i = 0; i < ranks.length; i++) {
+    ranks[i] = rankById[columns.reportIndex[i] + 1]
+  }
+  return ranks
+}
+
+// Returns row indices in sorted order. Only the sortable columns are honoured,
+// matching the column definitions in `usage-table/columns.tsx`.
+export function sortOrder(columns: UsageColumns, sorting: SortingState): Uint32Array {
+  const order = new Uint32Array(columns.credits.length)
+  for (let i = 0; i < order.length; i++) {
+    order[i] = i
+  }
+
+  const keys: { values: Float64Array; desc: boolean }[] = []
+  for (const sort of sorting) {
+    if (sort.id === 'report_name') {
+      keys.push({ values: reportRanks(columns), desc: sort.desc })
+    } else if (sort.id === 'credits_used') {
+      keys.push({ values: columns.credits, desc: sort.desc })
+    }
+  }
+  if (keys.length === 0) {
+    return order
+  }
+
+  return order.sort((a, b) => {
+    for (const { values, desc } of keys) {
+      const diff = values[a] > values[b] ? 1 : values[a] < values[b] ? -1 : 0
+      if (diff !== 0) {
+        return desc ? -diff : diff
+      }
+    }
+    return a - b
+  })
+}
@@ -0,0 +1,103 @@
+import type { SortingState } from '@tanstack/react-table'
+import type { DailyUsage, UsageColumns } from '@/lib/usage-columns'
+
+export type UsageWorkerRequest =
+  | { id: number; type: 'fetch'; url: string }
+  | { id: number; type: 'sort'; version: number; sorting: SortingState }
+
+export type UsageWorkerResponse =
+  | { id: number; type: 'usage'; version: number; columns: UsageColumns; daily: DailyUsage[] }
+  | { id: number; type: 'sorted'; order: Uint32Array }
+  | { id: number; type: 'stale' }
+  | { id: number; type: 'error'; message: string }
+
+// Omit doesn't distribute over unions, so strip the ID from each request type separately
+type WithoutId<T> = T extends unknown ? Omit<T, 'id'> : never
+
+type Pending = {
+  resolve: (response: UsageWorkerResponse) => void
+  reject: (error: Error) => void
+}
+
+// The worker failed to load or crashed
+export class UsageWorkerError extends Error {}
+
+// The data to sort was replaced by a newer fetch, or lost when the worker was restarted
+export class StaleUsageDataError extends Error {}
+
+let worker: Worker | undefined
+let nextId = 0
+const pending = new Map<number, Pending>()
+
+export function isUsageWorkerSupported(): boolean {
+  return typeof Worker !== 'undefined'
+}
+
+function getWorker(): Worker {
+  if (!worker) {
+    worker = new Worker(new URL('./usage.worker.ts', import.meta.url), { type: 'module' })
+    worker.addEventListener('message', (event: MessageEvent<UsageWorkerResponse>) => {
+      const response = event.data
+      const request = pending.get(response.id)
+      if (!request) return
+      pending.delete(response.id)
+      if (response.type === 'error') {
+        request.reject(new Error(response.message))
+      } else if (response.type === 'stale') {
+        request.reject(new StaleUsageDataError('Usage data has changed'))
+      } else {
+        request.resolve(response)
+      }
+    })
+    worker.addEventListener('error', event => {
+      event.preventDefault()
+      failWorker(new UsageWorkerError(`Usage worker failed: ${event.message || 'could not be loaded'}`))
+    })
+    worker.addEventListener('messageerror', () => {
+      failWorker(new UsageWorkerError('Usage worker sent a message that could not be deserialised'))
+    })
+  }
+  return worker
+}
+
+// Rejects everything in flight and drops the worker, so the next request starts a new one
+function failWorker(error: UsageWorkerError) {
+  worker?.terminate()
+  worker = undefined
+  for (const request of pending.values()) {
+    request.reject(error)
+  }
+  pending.clear()
+}
+
+function send(request: WithoutId<UsageWorkerRequest>): Promise<UsageWorkerResponse> {
+  const id = nextId++
+  return new Promise((resolve, reject) => {
+    pending.set(id, { resolve, reject })
+    getWorker().postMessage({ ...request, id })
+  })
+}
+
+export interface WorkerUsage {
+  version: number
+  columns: UsageColumns
+  daily: DailyUsage[]
+}
+
+export async function fetchUsageInWorker(url: string): Promise<WorkerUsage> {
+  const response = await send({ type: 'fetch', url })
+  if (response.type !== 'usage') {
+    throw new Error(`Unexpected usage worker response: ${response.type}`)
+  }
+  return { version: response.version, columns: response.columns, daily: response.daily }
+}
+
+// Sorts data the worker already holds. Rejects with a StaleUsageDataError if
+// the worker no longer holds `version`.
+export async function sortInWorker(version: number, sorting: SortingState): Promise<Uint32Array> {
+  const response = await send({ type: 'sort', version, sorting })
+  if (response.type !== 'sorted') {
+    throw new Error(`Unexpected usage worker response: ${response.type}`)
+  }
+  return response.order
+}
@@ -0,0 +1,61 @@
+import type { SortingState } from '@tanstack/react-table'
+import { aggregateDaily, sortOrder, toColumns, type UsageColumns } from '@/lib/usage-columns'
+import type { UsageWorkerRequest, UsageWorkerResponse } from '@/lib/usage-worker-client'
+
+// The most recently fetched data, kept here so sort requests only need to send the sorting state
+let columns: UsageColumns | undefined
+let columnsVersion = -1
+
+function reply(response: UsageWorkerResponse, transfer: Transferable[] = []) {
+  self.postMessage(response, { transfer })
+}
+
+async function fetchUsage(id: number, url: string) {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error('Network response was not ok')
+  }
+  // Parse here rather than with `response.json()` on the main thread
+  const data = JSON.parse(await response.text())
+  columns = toColumns(data.usage)
+  // The fetch request ID doubles as the version of the data
+  columnsVersion = id
+  const daily = aggregateDaily(columns)
+
+  // The worker keeps its own copy for sorting, the main thread gets the transferred buffers
+  const transferred: UsageColumns = {
+    ...columns,
+    messageIds: columns.messageIds.slice(),
+    times: columns.times.slice(),
+    credits: columns.credits.slice(),
+    reportIndex: columns.reportIndex.slice(),
+  }
+  reply({ id, type: 'usage', version: id, columns: transferred, daily }, [
+    transferred.messageIds.buffer,
+    transferred.times.buffer,
+    transferred.credits.buffer,
+    transferred.reportIndex.buffer,
+  ])
+}
+
+function sortUsage(id: number, version: number, sorting: SortingState) {
+  if (!columns || version !== columnsVersion) {
+    reply({ id, type: 'stale' })
+    return
+  }
+  const order = sortOrder(columns, sorting)
+  reply({ id, type: 'sorted', order }, [order.buffer])
+}
+
+self.addEventListener('message', async (event: MessageEvent<UsageWorkerRequest>) => {
+  const request = event.data
+  try {
+    if (request.type === 'fetch') {
+      await fetchUsage(request.id, request.url)
+    } else {
+      sortUsage(request.id, request.version, request.sorting)
+    }
+  } catch (error) {
+    reply({ id: request.id, type: 'error', message: error instanceof Error ? error.message : String(error) })
+  }
+})
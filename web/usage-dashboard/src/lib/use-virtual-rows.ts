@@ -0,0 +1,53 @@
+import { useCallback, useEffect, useState } from 'react'
+
+interface VirtualRowsOptions {
+  rowHeight: number
+  // Used until the container has been laid out, e.g. on first render or in jsdom
+  viewportHeight: number
+  overscan?: number
+}
+
+// Works out which rows of a fixed row height table are visible in a scroll
+// container, so only those need to be rendered
+export function useVirtualRows(count: number, { rowHeight, viewportHeight, overscan = 5 }: VirtualRowsOptions) {
+  const [container, setContainer] = useState<HTMLElement | null>(null)
+  const [scrollTop, setScrollTop] = useState(0)
+  const [height, setHeight] = useState(0)
+
+  useEffect(() => {
+    if (!container) return
+
+    const update = () => {
+      setScrollTop(container.scrollTop)
+      setHeight(container.clientHeight)
+    }
+    update()
+    container.addEventListener('scroll', update, { passive: true })
+    const observer = typeof ResizeObserver !== 'undefined' ? new ResizeObserver(update) : undefined
+    observer?.observe(container)
+    return () => {
+      container.removeEventListener('scroll', update)
+      observer?.disconnect()
+    }
+  }, [container])
+
+  const scrollToTop = useCallback(() => {
+    if (container) {
+      container.scrollTop = 0
+    }
+    setScrollTop(0)
+  }, [container])
+
+  const visibleHeight = height || viewportHeight
+  const start = Math.min(count, Math.max(0, Math.floor(scrollTop / rowHeight) - overscan))
+  const end = Math.min(count, Math.ceil((scrollTop + visibleHeight) / rowHeight) + overscan)
+
+  return {
+    containerRef: setContainer,
+    scrollToTop,
+    start,
+    end,
+    paddingTop: start * rowHeight,
+    paddingBottom: (count - end) * rowHeight,
+  }
+}
@@ -0,0 +1,48 @@
+import { useEffect, useState } from 'react'
+import { type SortingState } from '@tanstack/react-table'
+import { type UsageData, getWorkerUsage } from '@/lib/client'
+import { StaleUsageDataError, sortInWorker } from '@/lib/usage-worker-client'
+
+interface SortedUsage {
+  data: UsageData[]
+  rows: UsageData[]
+}
+
+// Sorts usage data in the usage worker when it was fetched there. Otherwise
+// `manualSorting` is false and the table sorts on the main thread as before.
+export function useWorkerSorting(data: UsageData[] | undefined, sorting: SortingState) {
+  const usage = getWorkerUsage(data)
+  const [sorted, setSorted] = useState<SortedUsage>()
+  // Data the worker couldn't sort, which the table sorts on the main thread instead
+  const [failedData, setFailedData] = useState<UsageData[]>()
+  const useWorker = usage !== undefined && failedData !== data
+
+  useEffect(() => {
+    if (!data || !usage || !useWorker || sorting.length === 0) return
+
+    let cancelled = false
+    sortInWorker(usage.version, sorting)
+      .then(order => {
+        if (!cancelled) {
+          setSorted({ data, rows: Array.from(order, index => data[index]) })
+        }
+      })
+      .catch(error => {
+        // A stale version means a newer fetch has replaced the data or the worker was restarted.
+        // Anything else is unexpected, so report it.
+        if (!(error instanceof StaleUsageDataError)) {
+          console.error('Failed to sort usage data in the worker', error)
+        }
+        if (!cancelled) {
+          setFailedData(data)
+        }
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [data, usage, useWorker, sorting])
+
+  // Keep showing the previous order until the worker replies
+  const rows = useWorker && sorting.length > 0 && sorted?.data === data ? sorted.rows : data
+  return { rows, manualSorting: useWorker }
+}
@@ -0,0 +1,40 @@
+import { bench, describe } from 'vitest'
+import { aggregateDaily, sortOrder, toColumns } from '../lib/usage-columns'
+import { type UsageData } from '@/lib/client'
+
+const ROW_COUNT = 200_000
+const REPORT_NAMES = ['Short Lease Report', 'Tenant Obligations Report', 'Landlord Responsibilities Report', null]
+
+const data: UsageData[] = Array.from({ length: ROW_COUNT }, (_, index) => ({
+  message_id: index,
+  timestamp: new Date(Date.UTC(2024, 3, 1) + index * 12_000).toISOString(),
+  report_name: REPORT_NAMES[index % REPORT_NAMES.length],
+  credits_used: (index % 97) / 7,
+}))
+const json = JSON.stringify({ usage: data })
+const columns = toColumns(data)
+
+describe(`parse ${ROW_COUNT} rows`, () => {
+  bench('JSON.parse', () => {
+    JSON.parse(json)
+  })
+
+  bench('JSON.parse + toColumns', () => {
+    toColumns(JSON.parse(json).usage)
+  })
+})
+
+describe(`daily chart rollup of ${ROW_COUNT} rows`, () => {
+  bench('aggregateDaily', () => {
+    aggregateDaily(columns)
+  })
+})
+
+describe(`sort ${ROW_COUNT} rows by report name then credits`, () => {
+  bench('sortOrder', () => {
+    sortOrder(columns, [
+      { id: 'report_name', desc: false },
+      { id: 'credits_used', desc: true },
+    ])
+  })
+})
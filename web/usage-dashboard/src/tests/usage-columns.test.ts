@@ -0,0 +1,57 @@
+import { aggregateDaily, fromColumns, sortOrder, toColumns } from '../lib/usage-columns'
+import { type UsageData } from '@/lib/client'
+
+const mockData: UsageData[] = [
+  { message_id: 1, timestamp: '2024-03-16T10:30:00Z', credits_used: 10, report_name: 'Report 10' },
+  { message_id: 2, timestamp: '2024-03-15T14:20:00Z', credits_used: 5, report_name: null },
+  { message_id: 3, timestamp: '2024-03-15T09:00:00Z', credits_used: 15, report_name: 'report 9' },
+  { message_id: 4, timestamp: '2024-03-16T11:00:00Z', credits_used: 5, report_name: 'Report 10' },
+]
+
+const sortedIds = (sorting: { id: string; desc: boolean }[]) => {
+  const columns = toColumns(mockData)
+  return Array.from(sortOrder(columns, sorting), index => mockData[index].message_id)
+}
+
+describe('usage-columns', () => {
+  describe('toColumns', () => {
+    it('should round trip through fromColumns', () => {
+      expect(fromColumns(toColumns(mockData))).toEqual(mockData)
+    })
+
+    it('should store report names once', () => {
+      const columns = toColumns(mockData)
+
+      expect(columns.reportNames).toEqual(['Report 10', 'report 9'])
+      expect(Array.from(columns.reportIndex)).toEqual([0, -1, 1, 0])
+    })
+  })
+
+  describe('aggregateDaily', () => {
+    it('should group credits by date in date order', () => {
+      expect(aggregateDaily(toColumns(mockData))).toEqual([
+        { date: '2024-03-15T00:00:00.000Z', credits: 20 },
+        { date: '2024-03-16T00:00:00.000Z', credits: 15 },
+      ])
+    })
+  })
+
+  describe('sortOrder', () => {
+    it('should keep the original order with no sorting', () => {
+      expect(sortedIds([])).toEqual([1, 2, 3, 4])
+    })
+
+    it('should sort report names alphanumerically with no report first', () => {
+      expect(sortedIds([{ id: 'report_name', desc: false }])).toEqual([2, 3, 1, 4])
+      expect(sortedIds([{ id: 'report_name', desc: true }])).toEqual([1, 4, 3, 2])
+    })
+
+    it('should sort by multiple columns in order', () => {
+      expect(sortedIds([{ id: 'credits_used', desc: false }, { id: 'report_name', desc: true }])).toEqual([4, 2, 1, 3])
+    })
+
+    it('should ignore columns that cannot be sorted', () => {
+      expect(sortedIds([{ id: 'message_id', desc: true }])).toEqual([1, 2, 3, 4])
+    })
+  })
+})